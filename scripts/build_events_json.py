@@ -2,11 +2,18 @@
 import argparse
 import json
 import re
-from dataclasses import dataclass
-from datetime import datetime
+import sys
+from calendar import monthrange
+from concurrent.futures import ProcessPoolExecutor
 from html import unescape
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib encoder produces the same file.
+    orjson = None
 
 
 PREFECTURES: list[str] = [
@@ -87,7 +94,12 @@ TOKYO_WARDS = [
 ]
 
 
+# Below this many table rows, process start-up costs more than parsing serially.
+_PARALLEL_MIN_ROWS = 5000
+
 COORD_RE = re.compile(r"^\s*-?\d+(?:\.\d+)?\s*,\s*-?\d+(?:\.\d+)?\s*$")
+_OVERSEAS_RE = re.compile("深圳|台北|上海")
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
 
 CITY_TO_PREF: list[tuple[str, str]] = [
     ("札幌市", "北海道"),
@@ -111,232 +123,240 @@ CITY_TO_PREF: list[tuple[str, str]] = [
     ("那覇市", "沖縄県"),
 ]
 
+CITY_TO_PREF_MAP: dict[str, str] = dict(CITY_TO_PREF)
+
+# Prefecture -> position in PREFECTURES (doubles as an O(1) membership set).
+_PREF_ORDER: dict[str, int] = {pref: i for i, pref in enumerate(PREFECTURES)}
+
+# Every location token mapped to (priority, list order, prefecture): prefectures win over
+# designated cities, which win over bare Tokyo wards.
+_LOCATION_TOKENS: dict[str, tuple[int, int, str]] = {}
+for _pref, _i in _PREF_ORDER.items():
+    _LOCATION_TOKENS.setdefault(_pref, (0, _i, _pref))
+for _i, (_city, _pref) in enumerate(CITY_TO_PREF_MAP.items()):
+    _LOCATION_TOKENS.setdefault(_city, (1, _i, _pref))
+for _i, _ward in enumerate(TOKYO_WARDS):
+    _LOCATION_TOKENS.setdefault(_ward, (2, _i, "東京都"))
+
+
+def _token_scanner(tokens: Iterable[str]) -> re.Pattern[str]:
+    # Single-pass scanner over all tokens. The lookahead makes matches overlap, so
+    # every occurrence is reported just like per-token `in` checks would.
+    alternation = "|".join(re.escape(t) for t in sorted(tokens, key=len, reverse=True))
+    return re.compile("(?=(" + alternation + "))")
+
+
+_LOCATION_RE = _token_scanner(_LOCATION_TOKENS)
+_PREF_RE = _token_scanner(_PREF_ORDER)
+
 
 def _split_md_row(line: str) -> list[str]:
     """
     Split a markdown table row by `|`, respecting escaped pipes (`\\|`).
     """
-    cells: list[str] = []
-    current: list[str] = []
-    escaped = False
-    for ch in line.rstrip("\n"):
-        if escaped:
-            current.append(ch)
-            escaped = False
-            continue
-        if ch == "\\":
-            escaped = True
-            continue
-        if ch == "|":
-            cells.append("".join(current))
-            current = []
-            continue
-        current.append(ch)
-    cells.append("".join(current))
+    text = line.rstrip("\n")
+    escaped = "\\" in text
+    if escaped:
+        # Swap escapes for sentinels (absent from markdown) so a plain split is safe:
+        # `\\` -> \x01, `\|` -> \x00, any other `\x` -> `x`.
+        text = text.replace("\\\\", "\x01").replace("\\|", "\x00").replace("\\", "")
+    cells = text.split("|")
 
     # Trim leading/trailing empty cell caused by leading/trailing pipes.
     if cells and cells[0].strip() == "":
         cells = cells[1:]
     if cells and cells[-1].strip() == "":
         cells = cells[:-1]
-    return [unescape(c.strip()).replace("\\|", "|") for c in cells]
+    if escaped:
+        cells = [c.replace("\x00", "|").replace("\x01", "\\") for c in cells]
+    # Cells come back fully stripped, so callers never need to strip again.
+    return [unescape(c).replace("\\|", "|").strip() for c in cells]
 
 
 def _split_urls(cell: str) -> list[str]:
-    text = cell.strip()
-    if not text:
+    # `<br>` is the only non-whitespace separator; turn it into a space and let the
+    # builtin whitespace split drop empties.
+    if not cell:
         return []
-    parts = re.split(r"(?:<br\s*/?>|\s+)", text, flags=re.IGNORECASE)
-    urls = [p.strip() for p in parts if p.strip()]
-    return urls
+    return _BR_RE.sub(" ", cell).split()
 
 
-def _infer_prefecture(*, address: str, title: str, venue: str) -> Optional[str]:
-    addr = (address or "").strip()
-    ttl = (title or "").strip()
-    vnm = (venue or "").strip()
-
-    if not addr:
-        return None
+def _classify_location(*, address: str, title: str, venue: str) -> tuple[Optional[str], str]:
+    """
+    Return (prefecture, location_kind) for a row in a single pass over the address.
+    All arguments are expected to be stripped already.
+    """
+    if not address:
+        return None, "unknown"
 
-    if "オンライン" in addr:
-        return None
+    if "オンライン" in address:
+        return None, "online"
 
-    # Overseas / non-prefecture locations.
-    if any(token in addr for token in ("深圳", "台北", "上海", "海外")):
-        return None
+    if _OVERSEAS_RE.search(address):
+        return None, "overseas"
 
-    for pref in PREFECTURES:
-        if pref in addr:
-            return pref
+    coord_match = COORD_RE.match(address) is not None
 
-    for city, pref in CITY_TO_PREF:
-        if city in addr:
-            return pref
+    # Prefecture, then city, then ward (some rows omit "東京都" but include the ward).
+    best: Optional[tuple[int, int, str]] = None
+    for m in _LOCATION_RE.finditer(address):
+        hit = _LOCATION_TOKENS[m.group(1)]
+        if best is None or hit < best:
+            best = hit
 
-    # Some rows omit "東京都" but include ward.
-    if any(ward in addr for ward in TOKYO_WARDS):
-        return "東京都"
+    # Heuristic: coordinates, a prefecture marker or ward/city names mean onsite.
+    if coord_match or best is not None or "区" in address or "市" in address:
+        kind = "onsite"
+    else:
+        kind = "unknown"
 
-    # Coordinate-only entries: use title/venue as hint.
-    if COORD_RE.match(addr):
-        for pref in PREFECTURES:
-            if pref in ttl or pref in vnm:
-                return pref
-        if "東京" in ttl or "東京" in vnm:
-            return "東京都"
-        return None
+    # Overseas / non-prefecture locations.
+    if "海外" in address:
+        return None, kind
 
-    return None
+    if best is not None:
+        return best[2], kind
 
+    # Coordinate-only entries: use title/venue as hint.
+    if coord_match:
+        hits = _PREF_RE.findall(title) + _PREF_RE.findall(venue)
+        if hits:
+            return min(hits, key=_PREF_ORDER.__getitem__), kind
+        if "東京" in title or "東京" in venue:
+            return "東京都", kind
 
-def _infer_location_kind(*, address: str) -> str:
-    addr = (address or "").strip()
-    if not addr:
-        return "unknown"
-    if "オンライン" in addr:
-        return "online"
-    if any(token in addr for token in ("深圳", "台北", "上海")):
-        return "overseas"
-    if COORD_RE.match(addr):
-        return "onsite"
-    # Heuristic: if address contains a prefecture marker or ward/city names, treat as onsite.
-    if any(pref in addr for pref in PREFECTURES) or "区" in addr or "市" in addr:
-        return "onsite"
-    return "unknown"
+    return None, kind
 
 
 def _parse_date(date_str: str) -> Optional[str]:
     s = (date_str or "").strip()
     if not s:
         return None
+    # Fixed `yyyy/mm/dd` shape: slice it by hand instead of going through strptime.
+    parts = s.split("/")
+    if len(parts) != 3:
+        return s
+    y, m, d = parts
+    if not (len(y) == 4 and 1 <= len(m) <= 2 and 1 <= len(d) <= 2):
+        return s
+    if not (y.isdecimal() and m.isdecimal() and d.isdecimal()):
+        return s
+    year, month, day = int(y), int(m), int(d)
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= monthrange(year, month)[1]:
+        return s
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def _parse_row(line: str) -> Optional[dict[str, Any]]:
+    cells = _split_md_row(line)
+    if len(cells) == 11:
+        (
+            id_str,
+            vol,
+            event_type,
+            title,
+            venue_name,
+            address,
+            connpass_url,
+            tweet_url_cell,
+            slide_url_cell,
+            participants_str,
+            date_str,
+        ) = cells
+    elif len(cells) == 14:
+        (
+            id_str,
+            vol,
+            event_type,
+            title,
+            _mode,
+            venue_name,
+            address,
+            connpass_url,
+            tweet_url_cell,
+            slide_url_cell,
+            participants_str,
+            date_str,
+            _weekday,
+            _time_range,
+        ) = cells
+    else:
+        # Skip malformed rows instead of guessing.
+        return None
+
+    # Low-cardinality columns: share one string object per distinct value across rows.
+    # (prefecture / location_kind already come from module constants.)
+    vol = sys.intern(vol)
+    event_type = sys.intern(event_type)
+
     try:
-        dt = datetime.strptime(s, "%Y/%m/%d")
+        event_id = int(id_str)
     except ValueError:
-        return s
-    return dt.date().isoformat()
-
-
-@dataclass(frozen=True)
-class EventRow:
-    id: int
-    vol: str
-    event_type: str
-    title: str
-    venue_name: str
-    address: str
-    connpass_url: str
-    tweet_urls: list[str]
-    slide_urls: list[str]
-    participants: Optional[int]
-    date: Optional[str]
-    prefecture: Optional[str]
-    location_kind: str
-
-    def as_dict(self) -> dict[str, Any]:
-        return {
-            "id": self.id,
-            "vol": self.vol,
-            "type": self.event_type,
-            "title": self.title,
-            "venue_name": self.venue_name,
-            "address": self.address,
-            "connpass_url": self.connpass_url,
-            "tweet_urls": self.tweet_urls,
-            "slide_urls": self.slide_urls,
-            "participants": self.participants,
-            "date": self.date,
-            "prefecture": self.prefecture,
-            "location_kind": self.location_kind,
-        }
-
-
-def parse_events(markdown_path: Path) -> list[EventRow]:
-    lines = markdown_path.read_text(encoding="utf-8").splitlines()
-    events: list[EventRow] = []
-    for line in lines:
-        if not line.startswith("|"):
-            continue
-        if re.match(r"^\|\s*-", line):
-            continue
-        if "| id |" in line:
-            continue
-        cells = _split_md_row(line)
-        if len(cells) == 11:
-            (
-                id_str,
-                vol,
-                event_type,
-                title,
-                venue_name,
-                address,
-                connpass_url,
-                tweet_url_cell,
-                slide_url_cell,
-                participants_str,
-                date_str,
-            ) = cells
-        elif len(cells) == 14:
-            (
-                id_str,
-                vol,
-                event_type,
-                title,
-                _mode,
-                venue_name,
-                address,
-                connpass_url,
-                tweet_url_cell,
-                slide_url_cell,
-                participants_str,
-                date_str,
-                _weekday,
-                _time_range,
-            ) = cells
-        else:
-            # Skip malformed rows instead of guessing.
-            continue
+        return None
 
+    participants: Optional[int] = None
+    if participants_str:
         try:
-            event_id = int(id_str)
+            participants = int(participants_str)
         except ValueError:
-            continue
-
-        participants: Optional[int] = None
-        if participants_str.strip():
-            try:
-                participants = int(participants_str)
-            except ValueError:
-                participants = None
-
-        date = _parse_date(date_str)
-        slide_urls = _split_urls(slide_url_cell)
-        tweet_urls = _split_urls(tweet_url_cell)
-        prefecture = _infer_prefecture(address=address, title=title, venue=venue_name)
-        location_kind = _infer_location_kind(address=address)
-
-        events.append(
-            EventRow(
-                id=event_id,
-                vol=vol,
-                event_type=event_type,
-                title=title,
-                venue_name=venue_name,
-                address=address,
-                connpass_url=connpass_url,
-                tweet_urls=tweet_urls,
-                slide_urls=slide_urls,
-                participants=participants,
-                date=date,
-                prefecture=prefecture,
-                location_kind=location_kind,
-            )
-        )
-
-    events.sort(key=lambda e: e.id)
+            participants = None
+
+    date = _parse_date(date_str)
+    slide_urls = _split_urls(slide_url_cell)
+    tweet_urls = _split_urls(tweet_url_cell)
+    prefecture, location_kind = _classify_location(address=address, title=title, venue=venue_name)
+
+    return {
+        "id": event_id,
+        "vol": vol,
+        "type": event_type,
+        "title": title,
+        "venue_name": venue_name,
+        "address": address,
+        "connpass_url": connpass_url,
+        "tweet_urls": tweet_urls,
+        "slide_urls": slide_urls,
+        "participants": participants,
+        "date": date,
+        "prefecture": prefecture,
+        "location_kind": location_kind,
+    }
+
+
+def parse_events(markdown_path: Path) -> list[dict[str, Any]]:
+    """
+    Parse the markdown table into JSON-ready event dicts, sorted by id.
+    """
+    # Filter pass: keep table rows, dropping the separator (`|---|`) and header rows.
+    with markdown_path.open(encoding="utf-8") as f:
+        table_rows = [
+            line
+            for line in f
+            if line.startswith("|") and not line[1:].lstrip().startswith("-") and not line.startswith("| id |")
+        ]
+
+    # Parse pass. Rows are independent; only fan out when the table is big enough to pay
+    # for the workers.
+    if len(table_rows) >= _PARALLEL_MIN_ROWS:
+        with ProcessPoolExecutor() as ex:
+            parsed = list(ex.map(_parse_row, table_rows, chunksize=512))
+    else:
+        parsed = [_parse_row(line) for line in table_rows]
+
+    events = [e for e in parsed if e is not None]
+    events.sort(key=itemgetter("id"))
     return events
 
 
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2) + b"\n")
+        return
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--in", dest="input_path", default="data/linedc_events.md")
@@ -348,18 +368,13 @@ def main() -> int:
     events = parse_events(input_path)
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(
-            {
-                "generated_from": str(input_path.as_posix()),
-                "event_count": len(events),
-                "events": [e.as_dict() for e in events],
-            },
-            ensure_ascii=False,
-            indent=2,
-        )
-        + "\n",
-        encoding="utf-8",
+    _write_json(
+        output_path,
+        {
+            "generated_from": str(input_path.as_posix()),
+            "event_count": len(events),
+            "events": events,
+        },
     )
     return 0
 
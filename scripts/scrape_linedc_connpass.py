@@ -1,15 +1,34 @@
 #!/usr/bin/env python3
 import argparse
+import atexit
+import dataclasses
+import functools
+import gzip
+import hashlib
+import http.client
 import json
+import os
 import re
+import socket
+import ssl
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from html.parser import HTMLParser
+from datetime import datetime
+from html import unescape
 from pathlib import Path
 from typing import Iterable, Optional
-from urllib.parse import urlparse
+from urllib.parse import quote, urljoin, urlparse, urlsplit
+
+try:
+    import orjson
+except ImportError:  # Optional speedup for the JSON caches (_write_json_cache); stdlib json writes the same bytes.
+    orjson = None
 
 
 LIST_URL_TEMPLATE = "https://linedevelopercommunity.connpass.com/event/?page={page}"
@@ -28,6 +47,9 @@ SLIDE_DOMAINS = {
     "docs.google.com",
 }
 
+# Exact slide hosts plus their subdomain suffixes, for one C-level `str.endswith` check per link.
+_SLIDE_HOST_SUFFIXES = tuple("." + d for d in SLIDE_DOMAINS)
+
 SHORTENER_DOMAINS = {
     "t.co",
     "bit.ly",
@@ -37,36 +59,242 @@ SHORTENER_DOMAINS = {
     "ow.ly",
 }
 
-_URL_RE = re.compile(r"https?://[^\s\"'<>]+")
-_BARE_URL_RE = re.compile(
-    r"(?:(?<=\s)|(?<=\()|(?<=\[)|(?<=\{)|^)"
+# One pass over the page for every link shape: href attributes, absolute URLs in text, and
+# scheme-less URLs of the domains we care about.
+_LINK_ANY_RE = re.compile(
+    r'(?i:href)="(?P<h>[^"]+)"'
+    r"|(?P<u>https?://[^\s\"'<>]+)"
+    r"|(?:(?<=\s)|(?<=\()|(?<=\[)|(?<=\{)|^)"
+    r"(?P<b>(?:www\.)?(?:togetter\.com|posfie\.com|speakerdeck\.com|slideshare\.net|www\.slideshare\.net|docs\.google\.com)/[^\s\"'<>]+)"
+)
+# The URL and bare-URL alternatives alone, for URLs nested inside an href value
+# (e.g. `href="/redirect?url=https://speakerdeck.com/..."`), which the href match consumes.
+_LINK_IN_HREF_RE = re.compile(
+    r"(?P<u>https?://[^\s\"'<>]+)"
+    r"|(?:(?<=\s)|(?<=\()|(?<=\[)|(?<=\{))"
+    r"(?P<b>(?:www\.)?(?:togetter\.com|posfie\.com|speakerdeck\.com|slideshare\.net|www\.slideshare\.net|docs\.google\.com)/[^\s\"'<>]+)"
+)
+# The bare-URL alternative alone, for bare URLs nested inside an absolute URL
+# (e.g. `https://t.co/abc(speakerdeck.com/...)`), which the URL match consumes.
+_BARE_IN_URL_RE = re.compile(
+    r"(?:(?<=\()|(?<=\[)|(?<=\{))"
     r"((?:www\.)?(?:togetter\.com|posfie\.com|speakerdeck\.com|slideshare\.net|www\.slideshare\.net|docs\.google\.com)/[^\s\"'<>]+)"
 )
 
+_WS_RE = re.compile(r"\s+")
+# str.translate table deleting C0 control characters and DEL.
+_CTRL_TABLE = dict.fromkeys([*range(0x20), 0x7F])
+_TAG_RE = re.compile(r"<[^>]+>")
+_TITLE_OPEN_RE = re.compile(r"<title>", re.IGNORECASE)
+_TITLE_CLOSE_RE = re.compile(r"</title>", re.IGNORECASE)
+_TITLE_DIV_RE = re.compile(r'<div\s+class="current_event_title">\s*(.*?)\s*</div>', re.IGNORECASE | re.DOTALL)
+_DATE_WD_RE = re.compile(r"(\d{4})/(\d{2})/(\d{2})\([^)]*\)")
+_DATE_RE = re.compile(r"(\d{4})/(\d{2})/(\d{2})")
+# `_SP` also accepts `&nbsp;` / `&#160;`, so the page never has to be copied just to replace them.
+_SP = r"(?:\s|&nbsp;|&#160;)*"
+_WEEKDAY_TIMERANGE_RE = re.compile(
+    rf"\d{{4}}/\d{{2}}/\d{{2}}\(([^)]+)\){_SP}(\d{{1,2}}:\d{{2}}){_SP}(?:～|〜|-){_SP}(\d{{1,2}}:\d{{2}})"
+)
+_WEEKDAY_ONLY_RE = re.compile(rf"\d{{4}}/\d{{2}}/\d{{2}}\(([^)]+)\){_SP}(\d{{1,2}}:\d{{2}})")
+_PLACE_START_RE = re.compile(r'<p\s+class="place_name[^"]*">', re.IGNORECASE)
+_ADR_START_RE = re.compile(r'<p\s+class="adr">', re.IGNORECASE)
+_SCHEMELESS_URL_RE = re.compile(
+    r"(togetter\.com|posfie\.com|speakerdeck\.com|slideshare\.net|www\.slideshare\.net|docs\.google\.com)/"
+)
+_ACTIVE_PAGE_RE = re.compile(r'<li[^>]*class="active"[^>]*>\s*<span>\s*(\d+)\s*</span>')
+_PAGE_PARAM_RE = re.compile(r"[?&]page=(\d+)")
+_EVENT_ID_RE = re.compile(r"/event/(\d+)/")
+_PARTICIPANTS_RES = [
+    re.compile(r"参加者（\s*(\d+)\s*人）"),
+    re.compile(r"参加者（\s*(\d+)\s*名）"),
+    re.compile(r"参加者\s*[（(]\s*(\d+)\s*(?:人|名)\s*[）)]"),
+    re.compile(r"参加者一覧（\s*(\d+)\s*(?:人|名)）"),
+    re.compile(r"参加者一覧\s*[（(]\s*(\d+)\s*(?:人|名)\s*[）)]"),
+]
+# `<a ... class="url summary" ... href="...">` in either attribute order (connpass list pages).
+_EVENT_ANCHOR_RE = re.compile(
+    r'<a(?=\s)(?=[^>]*\sclass="url summary")(?=[^>]*\shref="([^"]+)")', re.IGNORECASE
+)
+_VOL_RES = [
+    re.compile(r"vol\.?\s*(\d+)", re.IGNORECASE),
+    re.compile(r"(?:^|[^\w])#\s*(\d+)\b", re.IGNORECASE),
+    re.compile(r"第\s*(\d+)\s*(?:回|回目)", re.IGNORECASE),
+]
+# Venue/address keywords that mark an event as (partly) online. Case-sensitive, like the `in` checks it replaced.
+_ONLINE_RE = re.compile("オンライン|Zoom|Teams|Google Meet|YouTube|配信|ウェビナー")
+
 _SLIDE_CACHE: dict[str, bool] = {}
 _SLIDE_CACHE_PATH: Optional[Path] = None
+# Results added since the last save; saves with nothing new are skipped.
+_SLIDE_DIRTY = 0
+# The slide cache checkpoints itself after this many new results instead of on every page.
+_SLIDE_FLUSH_EVERY = 64
+# Slide checks run from worker threads (per-event workers and _LINK_POOL).
+_SLIDE_LOCK = threading.Lock()
+# Shared by all events: resolves one event's shortener links and validates its uncached slide URLs concurrently.
+_LINK_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="link")
+
+# Shortener URL -> [effective_url, resolved_at_epoch_seconds].
+_SHORTENER_CACHE: dict[str, list] = {}
+_SHORTENER_CACHE_PATH: Optional[Path] = None
+_SHORTENER_DIRTY = False
+_SHORTENER_TTL_SECONDS = 30 * 24 * 60 * 60
+
+# connpass URL -> {"row": EventRow fields, "fetched_at": epoch seconds, "validated_slides": bool, "version": int}.
+_ROW_CACHE: dict[str, dict] = {}
+# Bump whenever page parsing or EventRow changes (vol / mode rules, link filters, ...), so rows
+# cached by the old code are re-derived instead of reused.
+_ROW_CACHE_VERSION = 1
+_ROW_CACHE_PATH: Optional[Path] = None
+_ROW_DIRTY = False
+# False with --refresh (or --refresh-cache): re-derive every row, from cached pages unless
+# --refresh-cache also re-fetches them, but still write fresh rows back.
+_ROW_CACHE_READ = True
+# Participants and slide links keep changing around an event; a row is only reused once it was
+# fetched at least this long after the event date.
+_ROW_SETTLE_SECONDS = 30 * 24 * 60 * 60
+
+# Directory of gzip-compressed event / participation pages named `{sha1(url)}_{YYYYMMDD}.html.gz`,
+# where the date is the event's; None disables it. A stored page is served under the same settle
+# rule as the row cache (file mtime = fetch time), checked without opening the file.
+_PAGE_CACHE_DIR: Optional[Path] = None
+# sha1(url) -> (event date "YYYY/MM/DD", file), listed once when the cache is loaded.
+_PAGE_CACHE_INDEX: dict[str, tuple[str, Path]] = {}
+# False with --refresh-cache: re-fetch every page, but still store fresh ones.
+_PAGE_CACHE_READ = True
+
+
+def _read_json_cache(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        loaded = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return loaded if isinstance(loaded, dict) else {}
+
+
+# Cache files last written by an unsorted checkpoint; the final sorted save rewrites them even when clean.
+_UNSORTED_CACHE_PATHS: set[Path] = set()
+
+
+def _write_json_cache(path: Path, cache: dict, *, sort: bool) -> None:
+    """
+    Atomically write `cache`. Keys are sorted only when `sort` is set (the final save of a run), so
+    mid-run checkpoints skip the sort and the committed file still diffs cleanly.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(cache, option=orjson.OPT_SORT_KEYS if sort else None))
+    else:
+        # Compact separators: smaller files, and byte-identical to the orjson output.
+        tmp_path.write_text(
+            json.dumps(cache, ensure_ascii=False, sort_keys=sort, separators=(",", ":")), encoding="utf-8"
+        )
+    tmp_path.replace(path)
+    if sort:
+        _UNSORTED_CACHE_PATHS.discard(path)
+    else:
+        _UNSORTED_CACHE_PATHS.add(path)
+
+
+def _cache_needs_write(path: Optional[Path], dirty: bool, sort: bool) -> bool:
+    return path is not None and (dirty or (sort and path in _UNSORTED_CACHE_PATHS))
 
 
 def _load_slide_cache(path: Path) -> None:
-    global _SLIDE_CACHE, _SLIDE_CACHE_PATH
+    global _SLIDE_CACHE, _SLIDE_CACHE_PATH, _SLIDE_DIRTY
     _SLIDE_CACHE_PATH = path
-    if not path.exists():
-        _SLIDE_CACHE = {}
+    _SLIDE_DIRTY = 0
+    _SLIDE_CACHE = _read_json_cache(path)
+
+
+def _save_slide_cache(*, sort: bool = False) -> None:
+    global _SLIDE_DIRTY
+    if not _cache_needs_write(_SLIDE_CACHE_PATH, _SLIDE_DIRTY > 0, sort):
         return
-    try:
-        loaded = json.loads(path.read_text(encoding="utf-8"))
-        _SLIDE_CACHE = loaded if isinstance(loaded, dict) else {}
-    except Exception:
-        _SLIDE_CACHE = {}
+    _write_json_cache(_SLIDE_CACHE_PATH, _SLIDE_CACHE, sort=sort)
+    _SLIDE_DIRTY = 0
+
 
+def _load_shortener_cache(path: Path) -> None:
+    global _SHORTENER_CACHE, _SHORTENER_CACHE_PATH, _SHORTENER_DIRTY
+    _SHORTENER_CACHE_PATH = path
+    _SHORTENER_DIRTY = False
+    _SHORTENER_CACHE = _read_json_cache(path)
 
-def _save_slide_cache() -> None:
-    if _SLIDE_CACHE_PATH is None:
+
+def _save_shortener_cache(*, sort: bool = False) -> None:
+    global _SHORTENER_DIRTY
+    if not _cache_needs_write(_SHORTENER_CACHE_PATH, _SHORTENER_DIRTY, sort):
         return
-    _SLIDE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = _SLIDE_CACHE_PATH.with_suffix(".tmp")
-    tmp_path.write_text(json.dumps(_SLIDE_CACHE, ensure_ascii=False, sort_keys=True), encoding="utf-8")
-    tmp_path.replace(_SLIDE_CACHE_PATH)
+    _write_json_cache(_SHORTENER_CACHE_PATH, _SHORTENER_CACHE, sort=sort)
+    _SHORTENER_DIRTY = False
+
+
+def _load_row_cache(path: Path, *, refresh: bool) -> None:
+    global _ROW_CACHE, _ROW_CACHE_PATH, _ROW_DIRTY, _ROW_CACHE_READ
+    _ROW_CACHE_PATH = path
+    _ROW_DIRTY = False
+    _ROW_CACHE_READ = not refresh
+    _ROW_CACHE = _read_json_cache(path)
+
+
+def _load_page_cache(path: Path, *, refresh: bool) -> None:
+    global _PAGE_CACHE_DIR, _PAGE_CACHE_INDEX, _PAGE_CACHE_READ
+    _PAGE_CACHE_DIR = path
+    _PAGE_CACHE_READ = not refresh
+    _PAGE_CACHE_INDEX = {}
+    for file in path.glob("*_????????.html.gz"):
+        key, _sep, ymd = file.name[: -len(".html.gz")].rpartition("_")
+        _PAGE_CACHE_INDEX[key] = (f"{ymd[:4]}/{ymd[4:6]}/{ymd[6:]}", file)
+
+
+def _save_row_cache(*, sort: bool = False) -> None:
+    global _ROW_DIRTY
+    if not _cache_needs_write(_ROW_CACHE_PATH, _ROW_DIRTY, sort):
+        return
+    _write_json_cache(_ROW_CACHE_PATH, _ROW_CACHE, sort=sort)
+    _ROW_DIRTY = False
+
+
+def _save_caches(*, final: bool = False) -> None:
+    """
+    Per-page checkpoint, or the sorted end-of-run save when `final`. The slide cache flushes itself
+    every _SLIDE_FLUSH_EVERY results (see _set_slide), so checkpoints leave it alone.
+    """
+    if final:
+        _save_slide_cache(sort=True)
+    _save_shortener_cache(sort=final)
+    _save_row_cache(sort=final)
+
+
+# Keep whatever a run has learned even when it stops early on an error.
+atexit.register(_save_caches, final=True)
+
+
+def _set_slide(url: str, ok: bool) -> bool:
+    global _SLIDE_DIRTY
+    with _SLIDE_LOCK:
+        _SLIDE_CACHE[url] = ok
+        _SLIDE_DIRTY += 1
+        if _SLIDE_DIRTY >= _SLIDE_FLUSH_EVERY:
+            _save_slide_cache()
+    return ok
+
+
+def _curl_base_cmd(timeout_seconds: int) -> list[str]:
+    # Workaround: some environments intermittently fail DNS resolution for the connpass subdomain.
+    return [
+        "curl",
+        "-L",
+        "--max-time",
+        str(timeout_seconds),
+        "-sS",
+        "--connect-to",
+        "linedevelopercommunity.connpass.com:443:connpass.com:443",
+    ]
 
 
 def _run_curl(
@@ -75,67 +303,343 @@ def _run_curl(
     timeout_seconds: int = 30,
     head_only: bool = False,
     retries: int = 3,
+    max_bytes: Optional[int] = None,
 ) -> tuple[int, str, bytes]:
     """
     Returns (http_status, effective_url, body_bytes).
     Uses curl so we can rely on the caller's network settings.
     """
     marker = b"__CURLMETA__"
-    # Workaround: some environments intermittently fail DNS resolution for the connpass subdomain.
-    cmd = [
-        "curl",
-        "-L",
-        "--max-time",
-        str(timeout_seconds),
-        "-sS",
-        "--connect-to",
-        "linedevelopercommunity.connpass.com:443:connpass.com:443",
+    cmd = _curl_base_cmd(timeout_seconds)
+    if max_bytes is not None:
+        cmd += ["--range", f"0-{max_bytes - 1}"]
+    # Plain write-out fields rather than `%{json}`: curl before 8.x mangles non-ASCII `url_effective`
+    # in its JSON output. `%{stderr}` sends them to stderr, so stdout is exactly the body and never
+    # has to be split or copied.
+    cmd += [
+        "-o",
+        "/dev/null" if head_only else "-",
+        "-w",
+        "%{stderr}" + marker.decode("ascii") + "%{http_code} %{url_effective}\n",
     ]
-    if head_only:
-        cmd += ["-o", "/dev/null", "-w", marker.decode("ascii") + "%{http_code} %{url_effective}"]
-    else:
-        cmd += ["-o", "-", "-w", "\n" + marker.decode("ascii") + "%{http_code} %{url_effective}\n"]
     cmd.append(url)
 
     last_err: Optional[str] = None
     for attempt in range(max(1, retries + 1)):
         proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         if proc.returncode == 0:
-            raw = proc.stdout
+            body = proc.stdout
+            meta = proc.stderr
             break
-        last_err = proc.stderr.decode("utf-8", "ignore")
+        last_err = proc.stderr.split(marker, 1)[0].decode("utf-8", "ignore")
         # Small backoff for transient DNS / network failures.
         if attempt < retries:
             time.sleep(min(6, 1.0 * (2**attempt)))
             continue
         raise RuntimeError(f"curl failed ({proc.returncode}) for {url}: {last_err}")
 
-    if head_only:
-        meta = raw
-        body = b""
-    else:
-        idx = raw.rfind(b"\n" + marker)
-        if idx == -1:
-            idx = raw.rfind(marker)
-        if idx == -1:
-            raise RuntimeError(f"unexpected curl output (no meta marker) for {url}")
-        body = raw[:idx]
-        meta = raw[idx:].strip()
-
-    meta_text = meta.decode("utf-8", "ignore")
-    m = re.search(r"__CURLMETA__(\d{3})\s+(\S+)", meta_text)
-    if not m:
-        raise RuntimeError(f"unexpected curl meta for {url}: {meta_text!r}")
-    status = int(m.group(1))
-    effective_url = m.group(2)
+    start = meta.rfind(marker)
+    try:
+        if start == -1:
+            raise ValueError("no meta marker")
+        status_text, _sep, effective_url = meta[start + len(marker) :].decode("utf-8", "ignore").strip().partition(" ")
+        status = int(status_text)
+        if not effective_url:
+            raise ValueError("no effective URL")
+    except ValueError:
+        raise RuntimeError(f"unexpected curl meta for {url}: {meta.decode('utf-8', 'ignore')!r}") from None
     return status, effective_url, body
 
 
+def _curl_config_quote(value: str) -> str:
+    # curl config strings only understand \\ \" \t \n \r \v escapes; everything else, non-ASCII included, stays raw.
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _run_curl_many(
+    urls: list[str],
+    *,
+    timeout_seconds: int = 30,
+    parallel: int = 8,
+    sleep_s: float = 0.0,
+) -> dict[str, tuple[int, str, bytes]]:
+    """
+    GETs `urls` with one `curl --parallel` process, so DNS, TLS and keep-alive connections are shared.
+    Returns url -> (http_status, effective_url, body_bytes) for the transfers that completed; callers
+    fetch the rest one by one (with retries) as usual. `sleep_s` becomes curl's request rate limit.
+    """
+    with tempfile.TemporaryDirectory(prefix="linedc-curl-") as tmp:
+        out_dir = Path(tmp)
+        config = "".join(
+            f"url = {_curl_config_quote(url)}\noutput = {_curl_config_quote(str(out_dir / str(i)))}\n"
+            for i, url in enumerate(urls)
+        )
+        (out_dir / "urls.cfg").write_text(config, encoding="utf-8")
+        # `%{urlnum}` / `%{exitcode}` need curl >= 7.75, `--rate` needs 7.84. Plain fields rather than
+        # `%{json}`, which mangles non-ASCII `url_effective` before curl 8.x; the URL goes last.
+        cmd = _curl_base_cmd(timeout_seconds) + ["--parallel", "--parallel-max", str(max(1, parallel))]
+        if sleep_s > 0:
+            cmd += ["--rate", f"{max(1, round(60 / sleep_s))}/m"]
+        cmd += ["-w", "%{urlnum} %{exitcode} %{http_code} %{url_effective}\n", "-K", str(out_dir / "urls.cfg")]
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        results: dict[str, tuple[int, str, bytes]] = {}
+        for line in proc.stdout.decode("utf-8", "ignore").splitlines():
+            try:
+                urlnum, exitcode, http_code, effective_url = line.split(" ", 3)
+                if int(exitcode):
+                    continue
+                i = int(urlnum)
+                results[urls[i]] = (int(http_code), effective_url, (out_dir / str(i)).read_bytes())
+            except (ValueError, IndexError, OSError):
+                continue
+        return results
+
+
+# Hosts we connect to through another address (same as curl's `--connect-to`).
+# Workaround: some environments intermittently fail DNS resolution for the connpass subdomain.
+_CONNECT_TO = {
+    "linedevelopercommunity.connpass.com": "connpass.com",
+}
+
+_USER_AGENT = "Mozilla/5.0 (compatible; linedc-scraper; +https://github.com/n0bisuke/linedc)"
+_MAX_REDIRECTS = 20
+# Characters left as-is when percent-encoding a request target (what curl leaves alone).
+_TARGET_SAFE = "/?&=%:@!$'()*+,;~-._#"
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+# curl honours proxy env vars and other local network settings; stay on curl when any are set.
+_USE_POOL = not any(
+    os.environ.get(v) for v in ("https_proxy", "HTTPS_PROXY", "http_proxy", "HTTP_PROXY", "all_proxy", "ALL_PROXY")
+)
+
+_HTTP_POOL: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+_HTTP_POOL_LOCK = threading.Lock()
+# Hosts Python could not resolve or verify over TLS; these go straight to curl for the rest of the run.
+_CURL_ONLY_HOSTS: set[str] = set()
+
+
+class _PoolUnusableError(Exception):
+    """
+    Python could not connect to `host` at all (DNS or TLS setup failed); curl may still get through.
+    """
+
+    def __init__(self, host: str) -> None:
+        super().__init__(host)
+        self.host = host
+
+# One TLS context for every pooled connection (CA certificates load once), plus the last TLS session
+# per (host, port) so extra parallel connections to connpass resume instead of doing a full handshake.
+_SSL_CONTEXT = ssl.create_default_context()
+_TLS_SESSIONS: dict[tuple[str, int], ssl.SSLSession] = {}
+
+
+class _PooledHTTPSConnection(http.client.HTTPSConnection):
+    """
+    HTTPS connection on the shared TLS context that resumes the origin's last TLS session.
+    Dials `connect_host` when given (same as curl's `--connect-to`), keeping `host` for SNI and the Host header.
+    """
+
+    def __init__(self, host: str, *, connect_host: Optional[str] = None, **kwargs) -> None:
+        super().__init__(host, context=_SSL_CONTEXT, **kwargs)
+        self._connect_host = connect_host or self.host
+
+    def connect(self) -> None:
+        sock = socket.create_connection((self._connect_host, self.port), self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = self._context.wrap_socket(
+            sock, server_hostname=self.host, session=_TLS_SESSIONS.get((self.host, self.port))
+        )
+
+    def remember_session(self) -> None:
+        # TLS 1.3 tickets arrive after the handshake, so this runs once a response has been read.
+        session = self.sock.session if isinstance(self.sock, ssl.SSLSocket) else None
+        if session is not None:
+            _TLS_SESSIONS[(self.host, self.port)] = session
+
+
+def _checkout_connection(scheme: str, netloc: str, timeout_seconds: int) -> tuple[http.client.HTTPConnection, bool]:
+    """
+    Returns (connection, reused). Idle keep-alive connections are reused per (scheme, host).
+    """
+    with _HTTP_POOL_LOCK:
+        idle = _HTTP_POOL.get((scheme, netloc))
+        conn = idle.pop() if idle else None
+    if conn is not None:
+        conn.timeout = timeout_seconds
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout_seconds)
+        return conn, True
+
+    if netloc in _CURL_ONLY_HOSTS:
+        raise _PoolUnusableError(netloc)
+    if scheme == "http":
+        conn: http.client.HTTPConnection = http.client.HTTPConnection(netloc, timeout=timeout_seconds)
+    else:
+        host = urlsplit(f"//{netloc}").hostname or netloc
+        connect_host = _CONNECT_TO.get(host)
+        conn = _PooledHTTPSConnection(netloc, connect_host=connect_host, timeout=timeout_seconds)
+    # Connect here rather than lazily in request(), so DNS / TLS failures are pinned to this host
+    # (which may be a redirect target) instead of the URL the caller asked for.
+    try:
+        conn.connect()
+    except (socket.gaierror, ssl.SSLError) as e:
+        conn.close()
+        raise _PoolUnusableError(netloc) from e
+    except BaseException:
+        conn.close()
+        raise
+    return conn, False
+
+
+def _checkin_connection(scheme: str, netloc: str, conn: http.client.HTTPConnection) -> None:
+    if isinstance(conn, _PooledHTTPSConnection):
+        conn.remember_session()
+    with _HTTP_POOL_LOCK:
+        _HTTP_POOL.setdefault((scheme, netloc), []).append(conn)
+
+
+def _close_http_pool() -> None:
+    with _HTTP_POOL_LOCK:
+        conns = [c for idle in _HTTP_POOL.values() for c in idle]
+        _HTTP_POOL.clear()
+    for conn in conns:
+        conn.close()
+
+
+def _pooled_request(
+    url: str,
+    *,
+    timeout_seconds: int,
+    head_only: bool,
+    max_bytes: Optional[int],
+) -> tuple[int, str, bytes]:
+    """
+    Same contract as `_run_curl`, over pooled keep-alive connections. Follows redirects like `curl -L`.
+    """
+    method = "HEAD" if head_only else "GET"
+    headers = {"User-Agent": _USER_AGENT, "Accept": "*/*"}
+    if max_bytes is not None:
+        headers["Range"] = f"bytes=0-{max_bytes - 1}"
+
+    for _hop in range(_MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.netloc:
+            raise RuntimeError(f"unsupported URL: {url}")
+        netloc = parts.netloc.lower()
+        # Percent-encode non-ASCII and other unsafe characters like curl does; existing escapes stay.
+        target = quote((parts.path or "/") + (f"?{parts.query}" if parts.query else ""), safe=_TARGET_SAFE)
+
+        conn, reused = _checkout_connection(scheme, netloc, timeout_seconds)
+        try:
+            try:
+                conn.request(method, target, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; redial once.
+                conn.close()
+                conn, reused = _checkout_connection(scheme, netloc, timeout_seconds)
+                conn.request(method, target, headers=headers)
+                resp = conn.getresponse()
+
+            location = resp.getheader("Location")
+            if resp.status in _REDIRECT_STATUSES and location:
+                resp.read()
+                body = b""
+            elif max_bytes is not None:
+                body = resp.read(max_bytes)
+            else:
+                body = resp.read()
+        except BaseException:
+            conn.close()
+            raise
+
+        if resp.isclosed() and not resp.will_close:
+            _checkin_connection(scheme, netloc, conn)
+        else:
+            conn.close()
+
+        if resp.status in _REDIRECT_STATUSES and location:
+            # http.client decodes headers as latin-1; recover a raw UTF-8 Location before joining.
+            try:
+                location = location.encode("latin-1").decode("utf-8")
+            except UnicodeError:
+                pass
+            url = urljoin(url, location)
+            continue
+        return resp.status, url, body
+
+    raise RuntimeError(f"too many redirects for {url}")
+
+
+# Event pages fetched ahead by `_run_curl_many`; `_fetch` hands each one out once.
+_PREFETCHED: dict[str, tuple[int, str, bytes]] = {}
+
+
+def _uses_curl(url: str) -> bool:
+    return not _USE_POOL or _domain(url) in _CURL_ONLY_HOSTS
+
+
+def _fetch(
+    url: str,
+    *,
+    timeout_seconds: int = 30,
+    head_only: bool = False,
+    retries: int = 3,
+    max_bytes: Optional[int] = None,
+) -> tuple[int, str, bytes]:
+    """
+    Returns (http_status, effective_url, body_bytes).
+    Reuses keep-alive connections instead of spawning curl per URL; falls back to curl when a
+    proxy is configured or Python cannot resolve or verify a host on the way.
+    """
+    if not head_only and max_bytes is None:
+        prefetched = _PREFETCHED.pop(url, None)
+        if prefetched is not None:
+            return prefetched
+    host = _domain(url)
+    if _USE_POOL and host not in _CURL_ONLY_HOSTS:
+        for attempt in range(max(1, retries + 1)):
+            try:
+                return _pooled_request(url, timeout_seconds=timeout_seconds, head_only=head_only, max_bytes=max_bytes)
+            except _PoolUnusableError as e:
+                # Retrying will not help; only the host that failed is handed to curl from now on.
+                _CURL_ONLY_HOSTS.add(e.host)
+                break
+            except (UnicodeError, ValueError):
+                # URL http.client cannot send (e.g. a non-ASCII host); curl copes, so hand this one over.
+                break
+            except (OSError, http.client.HTTPException) as e:
+                # Small backoff for transient network failures.
+                if attempt < retries:
+                    time.sleep(min(6, 1.0 * (2**attempt)))
+                    continue
+                raise RuntimeError(f"request failed for {url}: {e}") from e
+    return _run_curl(url, timeout_seconds=timeout_seconds, head_only=head_only, retries=retries, max_bytes=max_bytes)
+
+
+def _title_tag_text(html: str) -> Optional[str]:
+    """
+    Raw text between the first `<title>` and the next `</title>`, or None.
+    Plain tag searches instead of a lazy `(.*?)` match over the whole page.
+    """
+    start = _TITLE_OPEN_RE.search(html)
+    if not start:
+        return None
+    end = _TITLE_CLOSE_RE.search(html, start.end())
+    if not end:
+        return None
+    return html[start.end() : end.start()]
+
+
 def _extract_title_from_html(html: str) -> Optional[str]:
-    m = re.search(r"<title>\s*(.*?)\s*</title>", html, re.IGNORECASE | re.DOTALL)
-    if not m:
+    text = _title_tag_text(html)
+    if text is None:
         return None
-    title = re.sub(r"\s+", " ", m.group(1)).strip()
+    title = _WS_RE.sub(" ", text).strip()
     return title or None
 
 
@@ -144,68 +648,35 @@ def is_valid_slide_url(url: str) -> bool:
     if cached is not None:
         return bool(cached)
     try:
-        cmd = [
-            "curl",
-            "-L",
-            "--max-time",
-            "18",
-            "-sS",
-            "--range",
-            "0-50000",
-            "-o",
-            "-",
-            "-w",
-            "\n__CURLMETA__%{http_code} %{url_effective}\n",
-            url,
-        ]
-        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if proc.returncode != 0:
-            _SLIDE_CACHE[url] = False
-            return False
-        raw = proc.stdout
-        idx = raw.rfind(b"\n__CURLMETA__")
-        if idx == -1:
-            _SLIDE_CACHE[url] = False
-            return False
-        body = raw[:idx]
-        meta_text = raw[idx:].decode("utf-8", "ignore").strip()
-        m = re.search(r"__CURLMETA__(\d{3})\s+(\S+)", meta_text)
-        if not m:
-            _SLIDE_CACHE[url] = False
-            return False
-        status = int(m.group(1))
+        status, _effective, body = _fetch(url, timeout_seconds=18, retries=0, max_bytes=50001)
     except Exception:
-        _SLIDE_CACHE[url] = False
-        return False
+        return _set_slide(url, False)
 
     if status != 200:
-        _SLIDE_CACHE[url] = False
-        return False
+        return _set_slide(url, False)
 
     try:
         text = body[:50000].decode("utf-8", "ignore")
     except Exception:
-        _SLIDE_CACHE[url] = True
-        return True
+        return _set_slide(url, True)
 
     title = _extract_title_from_html(text) or ""
     lowered = title.lower()
     if "not found" in lowered or "page not found" in lowered or "404" in lowered:
-        _SLIDE_CACHE[url] = False
-        return False
+        return _set_slide(url, False)
     if "ページが見つかりません" in title:
-        _SLIDE_CACHE[url] = False
-        return False
+        return _set_slide(url, False)
 
-    snippet = re.sub(r"\s+", " ", text[:2000]).lower()
+    snippet = _WS_RE.sub(" ", text[:2000]).lower()
     if "404" in snippet and "not found" in snippet:
-        _SLIDE_CACHE[url] = False
-        return False
+        return _set_slide(url, False)
 
-    _SLIDE_CACHE[url] = True
-    return True
+    return _set_slide(url, True)
 
 
+# URLs repeat heavily across events (shared slide decks, community links, connpass itself), so
+# host parsing is memoized for the whole run.
+@functools.lru_cache(maxsize=65536)
 def _domain(url: str) -> str:
     try:
         return (urlparse(url).netloc or "").lower()
@@ -213,14 +684,44 @@ def _domain(url: str) -> str:
         return ""
 
 
-def _is_tweet_summary_url(url: str) -> bool:
+@functools.lru_cache(maxsize=65536)
+def _host_and_path(url: str) -> tuple[str, str]:
     try:
         u = urlparse(url)
     except Exception:
-        return False
-    host = (u.netloc or "").lower()
-    path = u.path or ""
+        return "", ""
+    return (u.netloc or "").lower(), u.path or ""
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_shortener(url: str) -> str:
+    """
+    Returns the effective URL for a shortener link. Memoized per run and persisted with a TTL,
+    so repeated `t.co` / `bit.ly` links cost one HEAD at most. Unresolvable links map to themselves.
+    """
+    global _SHORTENER_DIRTY
+    now = time.time()
+    cached = _SHORTENER_CACHE.get(url)
+    # Malformed entries (hand edits, older formats) count as misses and get re-resolved.
+    if (
+        isinstance(cached, list)
+        and len(cached) == 2
+        and isinstance(cached[0], str)
+        and isinstance(cached[1], (int, float))
+        and now - cached[1] < _SHORTENER_TTL_SECONDS
+    ):
+        effective = cached[0]
+    else:
+        try:
+            _st, effective, _b = _fetch(url, timeout_seconds=12, head_only=True)
+        except Exception:
+            return url
+        _SHORTENER_CACHE[url] = [effective, now]
+        _SHORTENER_DIRTY = True
+    return effective
+
 
+def _is_tweet_summary_url(host: str, path: str) -> bool:
     if host in {"togetter.com", "min.togetter.com"}:
         return path.startswith("/li/") or path.startswith("/id/")
     if host.endswith(".togetter.com"):
@@ -233,18 +734,19 @@ def _is_tweet_summary_url(url: str) -> bool:
     return False
 
 
-class _ConnpassEventListParser(HTMLParser):
-    def __init__(self) -> None:
-        super().__init__()
-        self.event_urls: list[str] = []
-
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
-        if tag != "a":
-            return
-        attr = dict(attrs)
-        href = attr.get("href") or ""
-        if attr.get("class") == "url summary" and href:
-            self.event_urls.append(href)
+def _slide_kind(host: str) -> Optional[str]:
+    """
+    The SLIDE_DOMAINS entry `host` belongs to (itself or a parent domain), or None.
+    """
+    if host in SLIDE_DOMAINS:
+        return host
+    if not host.endswith(_SLIDE_HOST_SUFFIXES):
+        return None
+    while "." in host:
+        host = host.partition(".")[2]
+        if host in SLIDE_DOMAINS:
+            return host
+    return None
 
 
 @dataclass(frozen=True)
@@ -265,69 +767,69 @@ class EventRow:
 
 
 def _clean_text(s: str) -> str:
-    s = re.sub(r"[\x00-\x1f\x7f]", "", s)
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
+    return _WS_RE.sub(" ", s.translate(_CTRL_TABLE)).strip()
 
 
-def _extract_between(html: str, start_pat: str, end_pat: str) -> Optional[str]:
-    start = re.search(start_pat, html, re.IGNORECASE)
+def _extract_p_block(html: str, start_re: re.Pattern[str]) -> Optional[str]:
+    """
+    Markup between the first `start_re` match and the next `</p>`, or None.
+    """
+    start = start_re.search(html)
     if not start:
         return None
-    end = re.search(end_pat, html[start.end() :], re.IGNORECASE)
-    if not end:
+    # `</p>` has one letter, so its lower- and upper-case spellings are every case variant: two plain
+    # finds (the second bounded by the first) replace a case-insensitive regex search.
+    pos = start.end()
+    end = html.find("</p>", pos)
+    upper = html.find("</P>", pos, end if end != -1 else len(html))
+    if upper != -1:
+        end = upper
+    if end == -1:
         return None
-    return html[start.end() : start.end() + end.start()]
+    return html[pos:end]
 
 
 def _extract_title(html: str) -> str:
-    m = re.search(r'<div\s+class="current_event_title">\s*(.*?)\s*</div>', html, re.IGNORECASE | re.DOTALL)
-    if m:
-        return _clean_text(re.sub(r"<[^>]+>", "", m.group(1)))
-    m = re.search(r"<title>\s*(.*?)\s*</title>", html, re.IGNORECASE | re.DOTALL)
+    m = _TITLE_DIV_RE.search(html)
     if m:
-        return _clean_text(m.group(1))
+        return _clean_text(_TAG_RE.sub("", m.group(1)))
+    text = _title_tag_text(html)
+    if text is not None:
+        return _clean_text(text)
     raise RuntimeError("could not extract event title")
 
 
 def _extract_date(html: str) -> str:
-    m = re.search(r"(\d{4})/(\d{2})/(\d{2})\([^)]*\)", html)
+    m = _DATE_WD_RE.search(html)
     if not m:
-        m = re.search(r"(\d{4})/(\d{2})/(\d{2})", html)
+        m = _DATE_RE.search(html)
     if not m:
         raise RuntimeError("could not extract date")
     return f"{m.group(1)}/{m.group(2)}/{m.group(3)}"
 
 
+def _nbsp_to_space(text: str) -> str:
+    return text.replace("&nbsp;", " ").replace("&#160;", " ")
+
+
 def _extract_weekday_and_timerange(html: str) -> tuple[str, str]:
-    html = html.replace("&nbsp;", " ").replace("&#160;", " ")
-    m = re.search(
-        r"\d{4}/\d{2}/\d{2}\(([^)]+)\)\s*(\d{1,2}:\d{2})\s*(?:～|〜|-)\s*(\d{1,2}:\d{2})",
-        html,
-    )
+    m = _WEEKDAY_TIMERANGE_RE.search(html)
     if m:
-        weekday = _clean_text(m.group(1))
+        weekday = _clean_text(_nbsp_to_space(m.group(1)))
         time_range = f"{m.group(2)}~{m.group(3)}"
         return weekday, time_range
 
-    m = re.search(r"\d{4}/\d{2}/\d{2}\(([^)]+)\)\s*(\d{1,2}:\d{2})", html)
+    m = _WEEKDAY_ONLY_RE.search(html)
     if m:
-        weekday = _clean_text(m.group(1))
+        weekday = _clean_text(_nbsp_to_space(m.group(1)))
         return weekday, f"{m.group(2)}~"
 
     return "", ""
 
 
 def _extract_participants(html: str) -> int:
-    patterns = [
-        r"参加者（\s*(\d+)\s*人）",
-        r"参加者（\s*(\d+)\s*名）",
-        r"参加者\s*[（(]\s*(\d+)\s*(?:人|名)\s*[）)]",
-        r"参加者一覧（\s*(\d+)\s*(?:人|名)）",
-        r"参加者一覧\s*[（(]\s*(\d+)\s*(?:人|名)\s*[）)]",
-    ]
-    for pat in patterns:
-        m = re.search(pat, html)
+    for pat in _PARTICIPANTS_RES:
+        m = pat.search(html)
         if m:
             return int(m.group(1))
     if "当サイト以外で申し込み" in html or "申し込み不要" in html:
@@ -336,17 +838,17 @@ def _extract_participants(html: str) -> int:
 
 
 def _extract_place_name_and_address(html: str) -> tuple[str, str]:
-    place_block = _extract_between(html, r'<p\s+class="place_name[^"]*">', r"</p>")
+    place_block = _extract_p_block(html, _PLACE_START_RE)
     if place_block is None:
         venue_name = ""
     else:
-        venue_name = _clean_text(re.sub(r"<[^>]+>", "", place_block))
+        venue_name = _clean_text(_TAG_RE.sub("", place_block))
 
-    adr_block = _extract_between(html, r'<p\s+class="adr">', r"</p>")
+    adr_block = _extract_p_block(html, _ADR_START_RE)
     if adr_block is None:
         address = ""
     else:
-        address = _clean_text(re.sub(r"<[^>]+>", "", adr_block))
+        address = _clean_text(_TAG_RE.sub("", adr_block))
     return venue_name, address
 
 
@@ -355,8 +857,7 @@ def _infer_mode(venue_name: str, address: str) -> str:
     adr = (address or "").strip()
     combined = f"{venue} {adr}"
 
-    online_keywords = ["オンライン", "Zoom", "Teams", "Google Meet", "YouTube", "配信", "ウェビナー"]
-    is_online = any(k in combined for k in online_keywords)
+    is_online = _ONLINE_RE.search(combined) is not None
 
     if venue == "未定" and not adr:
         return "未定"
@@ -381,41 +882,35 @@ def _normalize_candidate_url(raw: str) -> Optional[str]:
         return raw
     if raw.startswith("www."):
         return "https://" + raw
-    if re.match(r"^(togetter\.com|posfie\.com|speakerdeck\.com|slideshare\.net|www\.slideshare\.net|docs\.google\.com)/", raw):
+    if _SCHEMELESS_URL_RE.match(raw):
         return "https://" + raw
     return None
 
 
 def _extract_links(html: str) -> list[str]:
-    hrefs = re.findall(r'<a\s+[^>]*href="([^"]+)"', html, re.IGNORECASE)
-    hrefs += _URL_RE.findall(html)
-    hrefs += _BARE_URL_RE.findall(html)
-    out: list[str] = []
-    seen: set[str] = set()
-    for href in hrefs:
-        href = _normalize_candidate_url(href) or ""
-        if not href:
-            continue
-        if href.startswith("#"):
-            continue
-        if href.startswith("javascript:"):
-            continue
-        if href in seen:
-            continue
-        seen.add(href)
-        out.append(href)
-    return out
+    # Bucket by link shape so the output keeps its order: hrefs, then URLs, then bare URLs.
+    buckets: dict[str, list[str]] = {"h": [], "u": [], "b": []}
+    # Hrefs and URLs swallow any link nested inside them, so those values are scanned again.
+    for m in _LINK_ANY_RE.finditer(html):
+        kind = m.lastgroup
+        buckets[kind].append(m.group(kind))
+        if kind == "h":
+            for n in _LINK_IN_HREF_RE.finditer(m.group(kind)):
+                buckets[n.lastgroup].append(n.group(n.lastgroup))
+                if n.lastgroup == "u":
+                    buckets["b"] += _BARE_IN_URL_RE.findall(n.group("u"))
+        elif kind == "u":
+            buckets["b"] += _BARE_IN_URL_RE.findall(m.group(kind))
+    # Pages repeat the same link many times; normalise each distinct raw string once.
+    raw = dict.fromkeys(buckets["h"] + buckets["u"] + buckets["b"])
+    normalized = (_normalize_candidate_url(href) for href in raw)
+    return list(dict.fromkeys(href for href in normalized if href and not href.startswith(("#", "javascript:"))))
 
 
 def _infer_type_and_vol(title: str) -> tuple[str, str]:
     vol = ""
-    patterns = [
-        r"vol\.?\s*(\d+)",
-        r"(?:^|[^\w])#\s*(\d+)\b",
-        r"第\s*(\d+)\s*(?:回|回目)",
-    ]
-    for pat in patterns:
-        m = re.search(pat, title, re.IGNORECASE)
+    for pat in _VOL_RES:
+        m = pat.search(title)
         if m:
             vol = f"vol.{m.group(1)}"
             break
@@ -460,37 +955,43 @@ def _event_row_from_html(
     except Exception as e:
         raise RuntimeError(f"{e} (url={url})") from e
 
-    links = _extract_links(html)
+    links = [(link, *_host_and_path(link)) for link in _extract_links(html)]
+    if resolve_shorteners:
+        # Resolve the page's shortener links concurrently up front; the loop below then hits the memo.
+        shorteners = [link for link, host, _path in links if host in SHORTENER_DOMAINS]
+        if len(shorteners) > 1:
+            list(_LINK_POOL.map(_resolve_shortener, shorteners))
     tweet_urls: list[str] = []
+    # Links are already unique, but two shorteners can resolve to the same deck.
     slide_urls_raw: list[str] = []
-    for link in links:
-        d = _domain(link)
-        if resolve_shorteners and d in SHORTENER_DOMAINS:
-            try:
-                _st, effective, _b = _run_curl(link, timeout_seconds=12, head_only=True)
-                link = effective
-                d = _domain(link)
-            except Exception:
-                pass
-        if _is_tweet_summary_url(link):
+    slide_seen: set[str] = set()
+    for link, host, path in links:
+        if resolve_shorteners and host in SHORTENER_DOMAINS:
+            link = _resolve_shortener(link)
+            host, path = _host_and_path(link)
+        if _is_tweet_summary_url(host, path):
             tweet_urls.append(link)
             continue
-        if any(d == sd or d.endswith("." + sd) for sd in SLIDE_DOMAINS):
+        kind = _slide_kind(host)
+        if kind is not None:
             # Speaker Deck slide images live on files.speakerdeck.com; keep only canonical deck pages.
-            if d.endswith(".speakerdeck.com") and d != "speakerdeck.com":
+            if kind == "speakerdeck.com" and host != kind:
                 continue
-            if d == "docs.google.com" and "/presentation/" not in link:
+            if host == "docs.google.com" and "/presentation/" not in link:
                 continue
-            slide_urls_raw.append(link)
+            if link not in slide_seen:
+                slide_seen.add(link)
+                slide_urls_raw.append(link)
 
     if validate_slides:
-        slide_urls: list[str] = []
-        for link in slide_urls_raw:
-            if is_valid_slide_url(link):
-                slide_urls.append(link)
+        # Fan uncached URLs out to the pool; the ordered pass below then only hits the cache.
+        pending = [u for u in slide_urls_raw if u not in _SLIDE_CACHE]
+        if len(pending) > 1:
+            list(_LINK_POOL.map(is_valid_slide_url, pending))
+        slide_urls = [link for link in slide_urls_raw if is_valid_slide_url(link)]
     else:
         # Fast path: skip HTTP validation to keep full rebuilds practical.
-        slide_urls = list(dict.fromkeys(slide_urls_raw))
+        slide_urls = slide_urls_raw
 
     return EventRow(
         vol=vol,
@@ -509,28 +1010,122 @@ def _event_row_from_html(
     )
 
 
+def _cached_event_row(url: str, *, validate_slides: bool) -> Optional[EventRow]:
+    entry = _ROW_CACHE.get(url) if _ROW_CACHE_READ else None
+    if not isinstance(entry, dict) or entry.get("version") != _ROW_CACHE_VERSION:
+        return None
+    if validate_slides and not entry.get("validated_slides"):
+        return None
+    try:
+        row = EventRow(**entry["row"])
+        settled = _is_settled(float(entry["fetched_at"]), row.date_yyyy_mm_dd)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return row if settled else None
+
+
+def _is_settled(fetched_at: float, date_yyyy_mm_dd: str) -> bool:
+    event_at = datetime.strptime(date_yyyy_mm_dd, "%Y/%m/%d").timestamp()
+    return fetched_at - event_at >= _ROW_SETTLE_SECONDS
+
+
+def _page_cache_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _cached_page_file(url: str) -> Optional[Path]:
+    """
+    Stored file for `url` if it was fetched once the event had settled. Only the index and the
+    file's mtime are consulted, so this is cheap enough for the curl prefetch filter.
+    """
+    if _PAGE_CACHE_DIR is None or not _PAGE_CACHE_READ:
+        return None
+    entry = _PAGE_CACHE_INDEX.get(_page_cache_key(url))
+    if entry is None:
+        return None
+    date, path = entry
+    try:
+        return path if _is_settled(path.stat().st_mtime, date) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _fetch_page(url: str, *, event_date: Optional[str] = None) -> tuple[int, str]:
+    """
+    GET an event page through the on-disk page cache and return (status, decoded html). Fresh 200
+    responses are stored under the event date (`event_date`, else read from the page itself), even
+    with --refresh-cache, so the next run can reuse them.
+    """
+    path = _cached_page_file(url)
+    if path is not None:
+        try:
+            return 200, gzip.decompress(path.read_bytes()).decode("utf-8", "ignore")
+        except (OSError, EOFError, zlib.error):
+            pass
+    status, _effective, body = _fetch(url, timeout_seconds=25, head_only=False)
+    html = body.decode("utf-8", "ignore")
+    if _PAGE_CACHE_DIR is not None and status == 200:
+        try:
+            date = event_date or _extract_date(html)
+        except RuntimeError:
+            # Without a date the page could never count as settled; don't store it.
+            return status, html
+        key = _page_cache_key(url)
+        path = _PAGE_CACHE_DIR / f"{key}_{date.replace('/', '')}.html.gz"
+        # The cache is best effort: a read-only or full disk must not fail a page that was fetched fine.
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(gzip.compress(body, compresslevel=1))
+            tmp_path.replace(path)
+            previous = _PAGE_CACHE_INDEX.get(key)
+            _PAGE_CACHE_INDEX[key] = (date, path)
+            if previous is not None and previous[1] != path:
+                previous[1].unlink(missing_ok=True)
+        except OSError:
+            pass
+    return status, html
+
+
 def _event_row_from_url(url: str, *, validate_slides: bool) -> EventRow:
-    status, _effective, body = _run_curl(url, timeout_seconds=25, head_only=False)
+    """
+    Event row for `url`, reusing the on-disk row cache for settled past events.
+    """
+    global _ROW_DIRTY
+    row = _cached_event_row(url, validate_slides=validate_slides)
+    if row is not None:
+        return row
+    fetched_at = time.time()
+    row = _fetch_event_row(url, validate_slides=validate_slides)
+    if _ROW_CACHE_PATH is not None:
+        _ROW_CACHE[url] = {
+            "row": dataclasses.asdict(row),
+            "fetched_at": fetched_at,
+            "validated_slides": validate_slides,
+            "version": _ROW_CACHE_VERSION,
+        }
+        _ROW_DIRTY = True
+    return row
+
+
+def _fetch_event_row(url: str, *, validate_slides: bool) -> EventRow:
+    status, html = _fetch_page(url)
     if status != 200:
         raise RuntimeError(f"unexpected status {status} for {url}")
-    html = body.decode("utf-8", "ignore")
 
+    # Resolve participants up front so the page is parsed once even when the count has to come
+    # from the participation page.
     try:
-        return _event_row_from_html(
-            html,
-            url=url,
-            validate_slides=validate_slides,
-            resolve_shorteners=True,
-        )
-    except RuntimeError as e:
-        if "could not extract participants" not in str(e):
-            raise
-
-    p_status, _p_eff, p_body = _run_curl(url.rstrip("/") + "/participation/", timeout_seconds=25, head_only=False)
-    if p_status != 200:
-        raise RuntimeError(f"could not extract participants (status={p_status}) (url={url})")
-    p_html = p_body.decode("utf-8", "ignore")
-    participants = _extract_participants(p_html)
+        participants = _extract_participants(html)
+    except RuntimeError:
+        try:
+            event_date: Optional[str] = _extract_date(html)
+        except RuntimeError:
+            event_date = None
+        p_status, p_html = _fetch_page(url.rstrip("/") + "/participation/", event_date=event_date)
+        if p_status != 200:
+            raise RuntimeError(f"could not extract participants (status={p_status}) (url={url})")
+        participants = _extract_participants(p_html)
     return _event_row_from_html(
         html,
         url=url,
@@ -540,24 +1135,54 @@ def _event_row_from_url(url: str, *, validate_slides: bool) -> EventRow:
     )
 
 
+def _event_rows_from_urls(urls: list[str], *, validate_slides: bool, workers: int, sleep_s: float) -> list[EventRow]:
+    """
+    Fetch and parse event pages with up to `workers` in flight, preserving input order.
+    `sleep_s` paces request starts, as in the serial loop.
+    """
+    if workers <= 1:
+        rows: list[EventRow] = []
+        for u in urls:
+            rows.append(_event_row_from_url(u, validate_slides=validate_slides))
+            if sleep_s:
+                time.sleep(sleep_s)
+        return rows
+
+    # Without the connection pool every page would be its own curl process; fetch the pages that
+    # still need fetching with one parallel curl instead.
+    curl_urls = [
+        u
+        for u in urls
+        if _uses_curl(u) and _cached_event_row(u, validate_slides=validate_slides) is None and _cached_page_file(u) is None
+    ]
+    prefetched: set[str] = set()
+    if len(curl_urls) > 1:
+        fetched = _run_curl_many(curl_urls, timeout_seconds=25, parallel=workers, sleep_s=sleep_s)
+        _PREFETCHED.update(fetched)
+        prefetched.update(fetched)
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        try:
+            futures = []
+            for u in urls:
+                futures.append(ex.submit(_event_row_from_url, u, validate_slides=validate_slides))
+                if sleep_s and u not in prefetched:
+                    time.sleep(sleep_s)
+            return [f.result() for f in futures]
+        except BaseException:
+            # Fail fast (first error or Ctrl-C) instead of letting the rest of the queue drain.
+            ex.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
 def _event_urls_from_list_page(page: int) -> list[str]:
     list_url = LIST_URL_TEMPLATE.format(page=page)
-    status, _effective, body = _run_curl(list_url, timeout_seconds=30, head_only=False)
+    status, _effective, body = _fetch(list_url, timeout_seconds=30, head_only=False)
     if status != 200:
         raise RuntimeError(f"unexpected status {status} for list page {list_url}")
 
     html = body.decode("utf-8", "ignore")
-    p = _ConnpassEventListParser()
-    p.feed(html)
-
-    seen: set[str] = set()
-    urls: list[str] = []
-    for u in p.event_urls:
-        if u in seen:
-            continue
-        seen.add(u)
-        urls.append(u)
-    return urls
+    return list(dict.fromkeys(unescape(m.group(1)) for m in _EVENT_ANCHOR_RE.finditer(html)))
 
 
 def _try_event_urls_from_list_page(page: int) -> list[str]:
@@ -576,66 +1201,62 @@ def _detect_oldest_page() -> int:
     Strategy: fetch a very large page number and read the "active" page number
     from the pagination, which represents the actual last page.
     """
-    status, _effective, body = _run_curl(LIST_URL_TEMPLATE.format(page=999999), timeout_seconds=20, head_only=False)
+    status, _effective, body = _fetch(LIST_URL_TEMPLATE.format(page=999999), timeout_seconds=20, head_only=False)
     if status != 200:
         raise RuntimeError("could not detect oldest page (non-200 on probe)")
 
     html = body.decode("utf-8", "ignore")
-    m = re.search(r'<li[^>]*class="active"[^>]*>\s*<span>\s*(\d+)\s*</span>', html)
+    m = _ACTIVE_PAGE_RE.search(html)
     if m:
         return int(m.group(1))
 
     # Fallback: use maximum page number visible in pagination links.
-    pages = [int(x) for x in re.findall(r"[?&]page=(\d+)", html)]
+    pages = [int(x) for x in _PAGE_PARAM_RE.findall(html)]
     if pages:
         return max(pages)
 
     raise RuntimeError("could not detect oldest page (no pagination found)")
 
 
+_TABLE_HEADER = (
+    "| id | vol | タイプ | タイトル | 実施形態 | 会場名 | 住所 | connpass URL | ツイートまとめ URL | LTスライド | 参加者数 | 日付 | 曜日 | 時間 |\n"
+    "|---:|:---:|:---|:---|:---:|:---|:---|:---|:---|:---|---:|:---:|:---:|:---:|\n"
+)
+
+
 def _ensure_table_header(path: Path) -> None:
     if path.exists() and path.read_text(encoding="utf-8").strip():
         return
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
-        "| id | vol | タイプ | タイトル | 実施形態 | 会場名 | 住所 | connpass URL | ツイートまとめ URL | LTスライド | 参加者数 | 日付 | 曜日 | 時間 |\n"
-        "|---:|:---:|:---|:---|:---:|:---|:---|:---|:---|:---|---:|:---:|:---:|:---:|\n",
-        encoding="utf-8",
-    )
+    path.write_text(_TABLE_HEADER, encoding="utf-8")
 
 
-def _next_id_from_file(path: Path) -> int:
+def _scan_existing(path: Path) -> tuple[int, set[str]]:
+    """
+    Returns (next id, connpass URLs already in the table) from one streaming pass over `path`.
+    """
     if not path.exists():
-        return 1
+        return 1, set()
     max_id = 0
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if not line.startswith("|"):
-            continue
-        cols = [c.strip() for c in line.strip("|").split("|")]
-        if not cols:
-            continue
-        try:
-            v = int(cols[0])
-        except Exception:
-            continue
-        max_id = max(max_id, v)
-    return max_id + 1
-
-
-def _existing_connpass_urls(path: Path) -> set[str]:
-    if not path.exists():
-        return set()
     urls: set[str] = set()
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if not line.startswith("|"):
-            continue
-        cols = [c.strip() for c in line.strip("|").split("|")]
-        if len(cols) < 8:
-            continue
-        url = cols[7]
-        if url.startswith("http"):
-            urls.add(url)
-    return urls
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith("|"):
+                continue
+            # Only the id (col 0) and connpass URL (col 7) are needed; leave the rest of the row unsplit.
+            cols = line.rstrip("\n").strip("|").split("|", 8)
+            try:
+                v = int(cols[0])
+            except ValueError:
+                pass
+            else:
+                max_id = max(max_id, v)
+            if len(cols) < 8:
+                continue
+            url = cols[7].strip()
+            if url.startswith("http"):
+                urls.add(url)
+    return max_id + 1, urls
 
 
 def _format_cell_links(urls: Iterable[str]) -> str:
@@ -645,12 +1266,15 @@ def _format_cell_links(urls: Iterable[str]) -> str:
     return "<br>".join(urls)
 
 
+_MD_CELL_TABLE = str.maketrans({"\r": " ", "\n": " ", "|": "&#124;"})
+
+
 def _md_escape_cell(s: str) -> str:
-    s = (s or "").replace("\r\n", "\n").replace("\r", "\n").replace("\n", " ")
-    return s.replace("|", "&#124;").strip()
+    # `\r\n` first so a CRLF still collapses to a single space.
+    return (s or "").replace("\r\n", "\n").translate(_MD_CELL_TABLE).strip()
 
 
-def append_rows(path: Path, rows: list[EventRow], start_id: int) -> None:
+def _format_rows(rows: list[EventRow], start_id: int) -> str:
     lines: list[str] = []
     for idx, row in enumerate(rows):
         row_id = start_id + idx
@@ -678,9 +1302,18 @@ def append_rows(path: Path, rows: list[EventRow], start_id: int) -> None:
             )
             + " |\n"
         )
+    return "".join(lines)
+
+
+def append_rows(path: Path, rows: list[EventRow], start_id: int) -> None:
     with path.open("a", encoding="utf-8") as f:
-        for line in lines:
-            f.write(line)
+        f.write(_format_rows(rows, start_id))
+
+
+def _write_table(path: Path, rows: list[EventRow]) -> None:
+    # Full rebuild: header and every row in one write, numbered from 1.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(_TABLE_HEADER + _format_rows(rows, 1), encoding="utf-8")
 
 
 def main(argv: list[str]) -> int:
@@ -690,10 +1323,16 @@ def main(argv: list[str]) -> int:
     ap.add_argument("--limit", type=int, default=5, help="number of NEW events to append")
     ap.add_argument("--out", type=str, default="data/linedc_events.md", help="output markdown file")
     ap.add_argument("--slide-cache", type=str, default="data/slide_url_cache.json", help="JSON cache for slide URL validation")
+    ap.add_argument("--shortener-cache", type=str, default="data/shortener_cache.json", help="JSON cache for resolved short URLs")
+    ap.add_argument("--row-cache", type=str, default="data/event_row_cache.json", help="JSON cache of parsed event rows")
+    ap.add_argument("--page-cache", type=str, default="data/cache/events", help="directory of cached event pages (gzip)")
+    ap.add_argument("--refresh", action="store_true", help="ignore cached event rows, re-parsing cached pages (fresh rows are still cached)")
+    ap.add_argument("--refresh-cache", action="store_true", help="re-fetch event pages instead of reading the page cache (implies --refresh)")
     ap.add_argument("--validate-slides", action="store_true", help="validate slide URLs by HTTP access (slow)")
     ap.add_argument("--raw-dir", type=str, default=None, help="offline mode: directory containing event_urls.txt and events/*.html")
     ap.add_argument("--sleep", type=float, default=0.0, help="sleep seconds between requests (politeness)")
     ap.add_argument("--rebuild", action="store_true", help="rebuild the markdown from scratch (overwrites --out)")
+    ap.add_argument("--workers", type=int, default=8, help="event pages fetched concurrently (1=serial)")
     args = ap.parse_args(argv)
 
     out_path = Path(args.out)
@@ -705,6 +1344,10 @@ def main(argv: list[str]) -> int:
 
     if args.validate_slides:
         _load_slide_cache(Path(args.slide_cache))
+    if raw_dir is None:
+        _load_shortener_cache(Path(args.shortener_cache))
+        _load_row_cache(Path(args.row_cache), refresh=args.refresh or args.refresh_cache)
+        _load_page_cache(Path(args.page_cache), refresh=args.refresh_cache)
 
     start_page = args.start_page
     if raw_dir is None and start_page == 0:
@@ -723,7 +1366,7 @@ def main(argv: list[str]) -> int:
 
             all_rows: list[EventRow] = []
             for u in urls:
-                m = re.search(r"/event/(\\d+)/", u)
+                m = _EVENT_ID_RE.search(u)
                 if not m:
                     continue
                 html_path = raw_dir / "events" / f"{m.group(1)}.html"
@@ -743,10 +1386,7 @@ def main(argv: list[str]) -> int:
                     time.sleep(sleep_s)
 
             all_rows.sort(key=lambda r: (r.date_yyyy_mm_dd, r.time_range, r.connpass_url))
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            out_path.write_text("", encoding="utf-8")
-            _ensure_table_header(out_path)
-            append_rows(out_path, all_rows, 1)
+            _write_table(out_path, all_rows)
             return 0
 
         all_rows: list[EventRow] = []
@@ -757,28 +1397,23 @@ def main(argv: list[str]) -> int:
                 raise RuntimeError(f"no event URLs found on page={page}")
             if sleep_s:
                 time.sleep(sleep_s)
-            for u in urls:
-                if u in seen_urls:
-                    continue
-                seen_urls.add(u)
-                all_rows.append(_event_row_from_url(u, validate_slides=args.validate_slides))
-                if sleep_s:
-                    time.sleep(sleep_s)
-            if args.validate_slides:
-                _save_slide_cache()
+            # List pages are already deduplicated; only drop URLs seen on earlier pages.
+            new_urls = [u for u in urls if u not in seen_urls]
+            seen_urls.update(new_urls)
+            all_rows.extend(
+                _event_rows_from_urls(
+                    new_urls, validate_slides=args.validate_slides, workers=args.workers, sleep_s=sleep_s
+                )
+            )
+            _save_caches()
 
         all_rows.sort(key=lambda r: (r.date_yyyy_mm_dd, r.time_range, r.connpass_url))
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text("", encoding="utf-8")
-        _ensure_table_header(out_path)
-        append_rows(out_path, all_rows, 1)
-        if args.validate_slides:
-            _save_slide_cache()
+        _write_table(out_path, all_rows)
+        _save_caches(final=True)
         return 0
 
     _ensure_table_header(out_path)
-    next_id = _next_id_from_file(out_path)
-    existing_urls = _existing_connpass_urls(out_path)
+    next_id, existing_urls = _scan_existing(out_path)
 
     remaining = args.limit
     current_id = next_id
@@ -792,13 +1427,12 @@ def main(argv: list[str]) -> int:
         if sleep_s:
             time.sleep(sleep_s)
 
-        rows: list[EventRow] = []
-        for u in urls:
-            if u in existing_urls:
-                continue
-            rows.append(_event_row_from_url(u, validate_slides=args.validate_slides))
-            if sleep_s:
-                time.sleep(sleep_s)
+        rows = _event_rows_from_urls(
+            [u for u in urls if u not in existing_urls],
+            validate_slides=args.validate_slides,
+            workers=args.workers,
+            sleep_s=sleep_s,
+        )
         rows.sort(key=lambda r: (r.date_yyyy_mm_dd, r.connpass_url))
 
         rows = rows[:remaining]
@@ -808,13 +1442,14 @@ def main(argv: list[str]) -> int:
                 existing_urls.add(r.connpass_url)
             current_id += len(rows)
             remaining -= len(rows)
-            if args.validate_slides:
-                _save_slide_cache()
+            _save_caches()
 
-    if args.validate_slides:
-        _save_slide_cache()
+    _save_caches(final=True)
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main(sys.argv[1:]))
+    try:
+        raise SystemExit(main(sys.argv[1:]))
+    finally:
+        _close_http_pool()